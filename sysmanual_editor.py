@@ -1,752 +1,1278 @@
-# sysmanual_editor.py (Canvas/Frame layout fix applied previously)
-
-import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext, filedialog
-import json
-from pathlib import Path
-from typing import List, Tuple
-import copy
-import re
-
-# Import the core utilities
-from sysmanual_core import SysManualCore 
-
-class SysManualGUIEditor:
-    def __init__(self, parent, framework):
-        self.framework = framework
-        self.core = framework.core # Access the SysManualCore instance
-        self.window = tk.Toplevel(parent)
-        self.window.title("SysManual GUI Editor")
-        self.window.geometry("1400x900")
-        
-        self.current_sysmanual = None
-        self.editing_item = None
-        
-        main_container = ttk.Frame(self.window)
-        main_container.pack(fill=tk.BOTH, expand=True)
-        
-        self.setup_toolbar()
-        
-        paned = ttk.PanedWindow(main_container, orient=tk.HORIZONTAL)
-        paned.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        left_frame = ttk.Frame(paned)
-        paned.add(left_frame, weight=1)
-        self.setup_tree(left_frame)
-        
-        right_frame = ttk.Frame(paned)
-        paned.add(right_frame, weight=2)
-        self.setup_edit_panel(right_frame)
-        
-        if framework.current_sysmanual:
-            self.load_sysmanual(framework.current_sysmanual)
-            
-    def _create_context_menu(self, widget, content_to_copy):
-        """Creates a right-click context menu for copying, primarily for text fields."""
-        # This calls the method in sysmanual_core.py, which now has the 'ttk' import.
-        return self.core.create_context_menu_for_editor(self.window, widget, content_to_copy)
-
-    def setup_toolbar(self):
-        toolbar = ttk.Frame(self.window)
-        toolbar.pack(fill=tk.X, padx=5, pady=5)
-        
-        ttk.Button(toolbar, text="New SysManual", command=self.new_sysmanual).pack(side=tk.LEFT, padx=2)
-        ttk.Button(toolbar, text="Open File", command=self.open_file).pack(side=tk.LEFT, padx=2)
-        ttk.Button(toolbar, text="Save", command=self.save_sysmanual).pack(side=tk.LEFT, padx=2)
-        
-        ttk.Separator(toolbar, orient=tk.VERTICAL).pack(side=tk.LEFT, padx=10, fill=tk.Y)
-        
-        ttk.Label(toolbar, text="Load:").pack(side=tk.LEFT, padx=(5, 2))
-        self.load_combo = ttk.Combobox(toolbar, values=list(self.framework.sysmanuals.keys()), 
-                                       state="readonly", width=20)
-        self.load_combo.pack(side=tk.LEFT, padx=2)
-        self.load_combo.bind("<<ComboboxSelected>>", lambda e: self.load_sysmanual(self.load_combo.get()))
-    
-    def setup_tree(self, parent):
-        tree_frame = ttk.Frame(parent)
-        tree_frame.pack(fill=tk.BOTH, expand=True)
-        
-        ttk.Label(tree_frame, text="Structure", font=('Arial', 11, 'bold')).pack(anchor=tk.W, pady=5)
-        
-        tree_scroll = ttk.Scrollbar(tree_frame)
-        tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        self.tree = ttk.Treeview(tree_frame, yscrollcommand=tree_scroll.set)
-        self.tree.pack(fill=tk.BOTH, expand=True)
-        tree_scroll.config(command=self.tree.yview)
-        
-        self.tree.bind('<<TreeviewSelect>>', self.on_tree_select)
-        self.tree.bind('<Button-3>', self.show_context_menu)
-    
-    def setup_edit_panel(self, parent):
-        # 1. Create Canvas and Scrollbar
-        canvas = tk.Canvas(parent)
-        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=canvas.yview)
-        
-        # 2. Create the inner frame that will hold the widgets
-        self.edit_frame = ttk.Frame(canvas)
-        
-        # 3. Define the configuration function for the inner frame
-        def on_edit_frame_configure(event):
-            # This adjusts the scroll region to encompass all inner frame contents
-            canvas.configure(scrollregion=canvas.bbox("all"))
-
-        # 4. Define the configuration function for the canvas itself
-        def on_canvas_configure(event):
-            # CRITICAL FIX (PREVIOUSLY APPLIED): Ensure the inner frame (the window) always matches the canvas's width
-            # This prevents widgets from packing off-screen horizontally
-            canvas.itemconfig(self.canvas_window, width=event.width)
-        
-        # 5. Bind the inner frame and the canvas
-        self.edit_frame.bind("<Configure>", on_edit_frame_configure)
-        canvas.bind('<Configure>', on_canvas_configure) # New binding for width control
-
-        # 6. Place the inner frame inside the canvas, saving the window ID
-        self.canvas_window = canvas.create_window((0, 0), window=self.edit_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # 7. Pack everything
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        # Bind mousewheel scrolling
-        def on_mousewheel(e):
-            canvas.yview_scroll(int(-1*(e.delta/120)), "units")
-        
-        for widget in [canvas, self.edit_frame, parent]:
-            widget.bind("<MouseWheel>", on_mousewheel)
-        
-        ttk.Label(self.edit_frame, text="Select an item to edit", 
-                 font=('Arial', 12)).pack(pady=20)
-    
-    def new_sysmanual(self):
-        if self.current_sysmanual and messagebox.askyesno("New SysManual", 
-            "Create new sysmanual? Unsaved changes will be lost."):
-            self.current_sysmanual = None
-            self.tree.delete(*self.tree.get_children())
-            self.clear_edit_panel()
-        
-        template = {
-            "id": "new-sysmanual",
-            "name": "New SysManual",
-            "description": "Description",
-            "theme": {"primary": "#4CAF50", "accent": "#2196F3"},
-            "categories": []
-        }
-        self.current_sysmanual = template
-        self.populate_tree()
-        
-        # Check if there are children before trying to select
-        children = self.tree.get_children()
-        if children:
-            self.tree.selection_set(children[0])
-            self.on_tree_select(None)
-    
-    def open_file(self):
-        filepath = filedialog.askopenfilename(
-            title="Open SysManual JSON",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
-            initialdir=Path("sysmanuals") if Path("sysmanuals").exists() else Path.cwd()
-        )
-        
-        if filepath:
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                if self.framework.validate_sysmanual(data):
-                    self.current_sysmanual = data
-                    self.populate_tree()
-                    messagebox.showinfo("Success", "Loaded successfully!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to open:\n{str(e)}")
-    
-    def load_sysmanual(self, sysmanual_id):
-        if sysmanual_id in self.framework.sysmanuals:
-            # Use deepcopy to prevent editing the framework's live data
-            self.current_sysmanual = copy.deepcopy(self.framework.sysmanuals[sysmanual_id])
-            self.populate_tree()
-    
-    def populate_tree(self):
-        self.tree.delete(*self.tree.get_children())
-        
-        if not self.current_sysmanual:
-            return
-        
-        root = self.tree.insert('', 'end', text=f"📘 {self.current_sysmanual['name']}", 
-                               values=('sysmanual',), open=True)
-        
-        for cat_idx, category in enumerate(self.current_sysmanual.get('categories', [])):
-            cat_node = self.tree.insert(root, 'end', text=f"📁 {category['name']}", 
-                                       values=('category', cat_idx), open=True)
-            
-            for entry_idx, entry in enumerate(category.get('entries', [])):
-                self.tree.insert(cat_node, 'end', text=f"📄 {entry['name']}", 
-                               values=('entry', cat_idx, entry_idx))
-        
-        self.window.lift()
-        self.window.focus_force()
-    
-    def on_tree_select(self, event):
-        selection = self.tree.selection()
-        if not selection:
-            return
-        
-        item = selection[0]
-        values = self.tree.item(item, 'values')
-        
-        if not values:
-            return
-        
-        item_type = values[0]
-        
-        if item_type == 'sysmanual':
-            self.show_sysmanual_editor()
-        elif item_type == 'category':
-            cat_idx = int(values[1])
-            self.show_category_editor(cat_idx)
-        elif item_type == 'entry':
-            cat_idx = int(values[1])
-            entry_idx = int(values[2])
-            self.show_entry_editor(cat_idx, entry_idx)
-    
-    def clear_edit_panel(self):
-        for widget in self.edit_frame.winfo_children():
-            widget.destroy()
-    
-    # --- Edit Panel Creators ---
-
-    def create_field(self, label, data_dict, key, parent=None):
-        if parent is None:
-            parent = self.edit_frame
-        
-        frame = ttk.Frame(parent)
-        frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        ttk.Label(frame, text=label, width=15).pack(side=tk.LEFT)
-        
-        var = tk.StringVar(value=data_dict.get(key, ''))
-        entry = ttk.Entry(frame, textvariable=var)
-        entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
-        
-        var.trace('w', lambda *args: data_dict.update({key: var.get()}))
-        
-        # Add right-click copy (This calls the fixed core method)
-        self._create_context_menu(entry, var.get())
-        
-        return entry
-    
-    def create_text_field(self, label, data_dict, key, height=5, parent=None):
-        if parent is None:
-            parent = self.edit_frame
-        
-        frame = ttk.LabelFrame(parent, text=label, padding=5)
-        frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        text = tk.Text(frame, height=height, wrap=tk.WORD)
-        text.pack(fill=tk.BOTH, expand=True)
-        text.insert('1.0', data_dict.get(key, ''))
-        
-        def update_text(*args):
-            data_dict[key] = text.get('1.0', 'end-1c')
-        
-        text.bind('<KeyRelease>', update_text)
-        
-        # Add right-click copy
-        self._create_context_menu(text, data_dict.get(key, ''))
-
-        return text
-
-    def create_content_row(self, parent, entry, key):
-        frame = ttk.Frame(parent)
-        frame.pack(fill=tk.X, pady=2)
-        
-        key_var = tk.StringVar(value=key)
-        value_var = tk.StringVar(value=entry['content'][key])
-        
-        ttk.Label(frame, text="Key:").pack(side=tk.LEFT)
-        key_entry = ttk.Entry(frame, textvariable=key_var, width=15)
-        key_entry.pack(side=tk.LEFT, padx=5)
-        
-        ttk.Label(frame, text="Value:").pack(side=tk.LEFT)
-        value_entry = ttk.Entry(frame, textvariable=value_var)
-        value_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
-        
-        def update_content(*args):
-            new_key = key_var.get()
-            # Ensure we only perform the delete/re-add if the key has actually changed.
-            if new_key != key and key in entry['content']:
-                value_to_save = entry['content'].pop(key)
-                entry['content'][new_key] = value_to_save
-                # NOTE: This dynamic re-keying is tricky in Tkinter as the lambda
-                # is bound to the *original* key variable. For full correctness 
-                # after a key change, the entire editor would need to be reloaded 
-                # or a more complex rebinding scheme used. For simplicity, we rely 
-                # on the dictionary structure for saving.
-            else:
-                entry['content'][new_key] = value_var.get()
-        
-        key_var.trace('w', update_content)
-        value_var.trace('w', update_content)
-        
-        # Add right-click copy for the Content fields
-        self._create_context_menu(key_entry, key_var.get())
-        self._create_context_menu(value_entry, value_var.get())
-        
-        # Using lambda to pass 'key' for proper deletion (based on current key)
-        ttk.Button(frame, text="×", width=3, 
-                  command=lambda k=key, f=frame: self.remove_content(parent, entry, k, f)).pack(side=tk.LEFT)
-
-    # --- Editor Displays ---
-
-    def show_sysmanual_editor(self):
-        self.clear_edit_panel()
-        
-        ttk.Label(self.edit_frame, text="SysManual Settings", 
-                 font=('Arial', 14, 'bold')).pack(anchor=tk.W, pady=(10, 20), padx=10)
-        
-        self.create_field("ID:", self.current_sysmanual, 'id')
-        self.create_field("Name:", self.current_sysmanual, 'name')
-        self.create_text_field("Description:", self.current_sysmanual, 'description', height=3)
-    
-    def show_category_editor(self, cat_idx):
-        self.clear_edit_panel()
-        
-        category = self.current_sysmanual['categories'][cat_idx]
-        
-        ttk.Label(self.edit_frame, text="Category Settings", 
-                 font=('Arial', 14, 'bold')).pack(anchor=tk.W, pady=(10, 20), padx=10)
-        
-        self.create_field("ID:", category, 'id')
-        self.create_field("Name:", category, 'name')
-        
-        ttk.Button(self.edit_frame, text="+ Add Entry", 
-                  command=lambda: self.add_entry(cat_idx)).pack(anchor=tk.W, padx=10, pady=10)
-    
-    def show_entry_editor(self, cat_idx, entry_idx):
-        self.clear_edit_panel()
-        
-        category = self.current_sysmanual['categories'][cat_idx]
-        entry = category['entries'][entry_idx]
-        
-        ttk.Label(self.edit_frame, text="Entry Editor", 
-                 font=('Arial', 14, 'bold')).pack(anchor=tk.W, pady=(10, 20), padx=10)
-        
-        self.create_field("ID:", entry, 'id')
-        self.create_field("Name:", entry, 'name')
-        self.create_text_field("Description:", entry, 'description', height=3)
-        
-        # Content
-        content_frame = ttk.LabelFrame(self.edit_frame, text="Content", padding=10)
-        content_frame.pack(fill=tk.BOTH, padx=10, pady=10)
-        if 'content' not in entry: entry['content'] = {}
-        for key in list(entry['content'].keys()):
-            self.create_content_row(content_frame, entry, key)
-        ttk.Button(content_frame, text="+ Add Content Field", 
-                  command=lambda: self.add_content_field(content_frame, entry)).pack(anchor=tk.W, pady=5)
-        
-        # Examples
-        examples_frame = ttk.LabelFrame(self.edit_frame, text="Examples", padding=10)
-        examples_frame.pack(fill=tk.BOTH, padx=10, pady=10)
-        if 'examples' not in entry: entry['examples'] = []
-        for idx, example in enumerate(entry['examples']):
-            self.create_example_row(examples_frame, entry, idx)
-        ttk.Button(examples_frame, text="+ Add Example", 
-                  command=lambda: self.add_example(examples_frame, entry)).pack(anchor=tk.W, pady=5)
-        
-        # Details
-        details_frame = ttk.LabelFrame(self.edit_frame, text="Details", padding=10)
-        details_frame.pack(fill=tk.BOTH, padx=10, pady=10)
-        if 'details' not in entry: entry['details'] = []
-        for idx, detail in enumerate(entry['details']):
-            self.create_detail_row(details_frame, entry, idx)
-        ttk.Button(details_frame, text="+ Add Detail", 
-                  command=lambda: self.add_detail(details_frame, entry)).pack(anchor=tk.W, pady=5)
-        
-        # Notes
-        self.create_text_field("Notes:", entry, 'notes', height=3)
-        
-    # --- Item Manipulators (Add/Remove) ---
-        
-    def add_content_field(self, parent, entry):
-        key = f"field_{len(entry['content']) + 1}"
-        entry['content'][key] = ""
-        self.create_content_row(parent, entry, key)
-    
-    def remove_content(self, parent, entry, key_to_delete, frame):
-        # Delete based on key or value if key was renamed
-        if key_to_delete in entry['content']:
-            del entry['content'][key_to_delete]
-        else:
-             # Fallback if key was renamed but the old key is still referenced by the lambda
-             for k, v in list(entry['content'].items()):
-                 if v == entry['content'].get(key_to_delete):
-                     del entry['content'][k]
-                     break
-        frame.destroy()
-
-    def create_example_row(self, parent, entry, idx):
-        frame = ttk.LabelFrame(parent, text=f"Example {idx + 1}", padding=5)
-        frame.pack(fill=tk.X, pady=5)
-        
-        example = entry['examples'][idx]
-        
-        if isinstance(example, str):
-            example = {"command": example, "description": ""}
-            entry['examples'][idx] = example
-        
-        cmd_frame = ttk.Frame(frame); cmd_frame.pack(fill=tk.X, pady=2)
-        ttk.Label(cmd_frame, text="Command:").pack(side=tk.LEFT)
-        cmd_var = tk.StringVar(value=example.get('command', ''))
-        cmd_entry = ttk.Entry(cmd_frame, textvariable=cmd_var)
-        cmd_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
-        cmd_var.trace('w', lambda *args: example.update({'command': cmd_var.get()}))
-        self._create_context_menu(cmd_entry, cmd_var.get())
-        
-        desc_frame = ttk.Frame(frame); desc_frame.pack(fill=tk.X, pady=2)
-        ttk.Label(desc_frame, text="Description:").pack(side=tk.LEFT)
-        desc_var = tk.StringVar(value=example.get('description', ''))
-        desc_entry = ttk.Entry(desc_frame, textvariable=desc_var)
-        desc_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
-        desc_var.trace('w', lambda *args: example.update({'description': desc_var.get()}))
-        self._create_context_menu(desc_entry, desc_var.get())
-        
-        # Using lambda to capture the current frame and index for removal
-        ttk.Button(frame, text="Remove Example", 
-                  command=lambda p=parent, e=entry, i=idx, f=frame: self.remove_example(p, e, i, f)).pack(anchor=tk.E, pady=2)
-    
-    def add_example(self, parent, entry):
-        entry['examples'].append({"command": "", "description": ""})
-        # Re-draw the examples to ensure idx is correct
-        for widget in parent.winfo_children():
-            if isinstance(widget, ttk.LabelFrame): # Only destroy dynamic example label frames
-                widget.destroy()
-        for i, example in enumerate(entry['examples']):
-            self.create_example_row(parent, entry, i)
-    
-    def remove_example(self, parent, entry, idx, frame):
-        if idx < len(entry['examples']):
-            entry['examples'].pop(idx)
-        frame.destroy()
-        # Re-draw the examples to ensure idx is correct
-        for widget in parent.winfo_children():
-            if isinstance(widget, ttk.LabelFrame):
-                widget.destroy()
-        for i, example in enumerate(entry['examples']):
-            self.create_example_row(parent, entry, i)
-    
-    def create_detail_row(self, parent, entry, idx):
-        frame = ttk.Frame(parent)
-        frame.pack(fill=tk.X, pady=2)
-        
-        detail = entry['details'][idx]
-        
-        ttk.Label(frame, text="Label:").pack(side=tk.LEFT)
-        label_var = tk.StringVar(value=detail.get('label', ''))
-        label_entry = ttk.Entry(frame, textvariable=label_var, width=20)
-        label_entry.pack(side=tk.LEFT, padx=5)
-        label_var.trace('w', lambda *args: detail.update({'label': label_var.get()}))
-        self._create_context_menu(label_entry, label_var.get())
-
-        
-        ttk.Label(frame, text="Value:").pack(side=tk.LEFT)
-        value_var = tk.StringVar(value=detail.get('value', ''))
-        value_entry = ttk.Entry(frame, textvariable=value_var)
-        value_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
-        value_var.trace('w', lambda *args: detail.update({'value': value_var.get()}))
-        self._create_context_menu(value_entry, value_var.get())
-
-        
-        ttk.Button(frame, text="×", width=3,
-                  command=lambda p=parent, e=entry, i=idx, f=frame: self.remove_detail(p, e, i, f)).pack(side=tk.LEFT)
-    
-    def add_detail(self, parent, entry):
-        entry['details'].append({"label": "", "value": ""})
-        # Re-create the new row only
-        self.create_detail_row(parent, entry, len(entry['details']) - 1)
-    
-    def remove_detail(self, parent, entry, idx, frame):
-        if idx < len(entry['details']):
-            entry['details'].pop(idx)
-        frame.destroy()
-
-        # Re-draw all details to fix indexing (optional but cleaner)
-        for w in parent.winfo_children():
-            if isinstance(w, ttk.Frame) and w != parent.winfo_children()[-1]: # Don't destroy the Add button
-                 w.destroy()
-        for i, detail in enumerate(entry['details']):
-            self.create_detail_row(parent, entry, i)
-    
-    # --- Duplication Methods ---
-    
-    def duplicate_category(self, cat_idx: int):
-        if not self.current_sysmanual:
-            return
-
-        categories = self.current_sysmanual['categories']
-        original_category = categories[cat_idx]
-        
-        existing_cat_ids = [c['id'] for c in categories]
-        all_entry_ids = self.core.get_all_entry_ids(self.current_sysmanual)
-
-        # Use the core utility for deep copy and ID/Name processing
-        new_category = self.core.process_duplicated_category(original_category, existing_cat_ids, all_entry_ids)
-        
-        # Insert the new category right after the original
-        categories.insert(cat_idx + 1, new_category)
-        
-        self.populate_tree()
-        
-        # Select the newly created category (index increases by 1)
-        self.select_item_after_move('category', ('category', cat_idx), 1)
-
-    def duplicate_entry(self, cat_idx: int, entry_idx: int):
-        if not self.current_sysmanual:
-            return
-        
-        category = self.current_sysmanual['categories'][cat_idx]
-        entries = category['entries']
-        original_entry = entries[entry_idx]
-
-        all_entry_ids = self.core.get_all_entry_ids(self.current_sysmanual)
-        
-        # Use the core utility for deep copy and ID/Name processing
-        new_entry = self.core.process_duplicated_entry(original_entry, all_entry_ids)
-
-        # Insert the new entry right after the original
-        entries.insert(entry_idx + 1, new_entry)
-        
-        self.populate_tree()
-        
-        # Select the newly created entry (entry index increases by 1)
-        self.select_item_after_move('entry', ('entry', cat_idx, entry_idx), 1)
-
-    # --- Tree/Data Manipulators (Move/Delete/Context) ---
-
-    def show_context_menu(self, event):
-        item = self.tree.identify_row(event.y)
-        if not item:
-            return
-        
-        self.tree.selection_set(item)
-        values = self.tree.item(item, 'values')
-        
-        context_menu = tk.Menu(self.tree, tearoff=0)
-        
-        if not values or values[0] == 'sysmanual':
-            context_menu.add_command(label="Add Category", command=self.add_category)
-        elif values[0] == 'category':
-            cat_idx = int(values[1])
-            context_menu.add_command(label="Add Entry", command=lambda: self.add_entry(cat_idx))
-            context_menu.add_command(label="Duplicate Category", command=lambda: self.duplicate_category(cat_idx))
-            context_menu.add_separator()
-            context_menu.add_command(label="Move Up ↑", command=self.move_item_up)
-            context_menu.add_command(label="Move Down ↓", command=self.move_item_down)
-            context_menu.add_separator()
-            context_menu.add_command(label="Delete Category", command=self.delete_item)
-        elif values[0] == 'entry':
-            cat_idx = int(values[1])
-            entry_idx = int(values[2])
-            context_menu.add_command(label="Duplicate Entry", command=lambda: self.duplicate_entry(cat_idx, entry_idx))
-            context_menu.add_separator()
-            context_menu.add_command(label="Move Up ↑", command=self.move_item_up)
-            context_menu.add_command(label="Move Down ↓", command=self.move_item_down)
-            context_menu.add_separator()
-            context_menu.add_command(label="Delete Entry", command=self.delete_item)
-        
-        context_menu.post(event.x_root, event.y_root)
-    
-    def add_category(self):
-        if not self.current_sysmanual:
-            return
-        
-        existing_cat_ids = [c['id'] for c in self.current_sysmanual['categories']]
-        base_id = "new-category"
-        base_name = "New Category"
-        
-        new_name, new_id = self.core.get_unique_name_and_id(base_name, base_id, existing_cat_ids)
-        
-        category = {
-            "id": new_id,
-            "name": new_name,
-            "entries": []
-        }
-        self.current_sysmanual['categories'].append(category)
-        self.populate_tree()
-    
-    def add_entry(self, cat_idx=None):
-        if not self.current_sysmanual:
-            return
-        
-        if cat_idx is None:
-            selection = self.tree.selection()
-            if not selection:
-                return
-            
-            values = self.tree.item(selection[0], 'values')
-            if not values or values[0] not in ['category', 'entry']:
-                return
-            
-            cat_idx = int(values[1])
-        
-        category = self.current_sysmanual['categories'][cat_idx]
-        entries = category['entries']
-        
-        # Get existing entry IDs for safe creation (across all categories)
-        all_entry_ids = self.core.get_all_entry_ids(self.current_sysmanual)
-        
-        base_id = "new-entry"
-        base_name = "New Entry"
-        
-        new_name, new_id = self.core.get_unique_name_and_id(base_name, base_id, all_entry_ids)
-
-        entry = {
-            "id": new_id,
-            "name": new_name,
-            "description": "Description",
-            "content": {},
-            "examples": [],
-            "details": [],
-            "notes": ""
-        }
-        entries.append(entry)
-        self.populate_tree()
-    
-    def delete_item(self):
-        selection = self.tree.selection()
-        if not selection: return
-        
-        values = self.tree.item(selection[0], 'values')
-        if not values: return
-        
-        item_type = values[0]
-        
-        if item_type == 'sysmanual': return
-        
-        if not messagebox.askyesno("Confirm Delete", f"Delete this {item_type}?"):
-            self.window.lift(); self.window.focus_force(); return
-        
-        if item_type == 'category':
-            cat_idx = int(values[1])
-            self.current_sysmanual['categories'].pop(cat_idx)
-        elif item_type == 'entry':
-            cat_idx = int(values[1])
-            entry_idx = int(values[2])
-            self.current_sysmanual['categories'][cat_idx]['entries'].pop(entry_idx)
-        
-        self.populate_tree()
-        self.clear_edit_panel()
-    
-    def move_item_up(self):
-        selection = self.tree.selection()
-        if not selection: return
-        
-        values = self.tree.item(selection[0], 'values')
-        if not values: return
-        
-        item_type = values[0]
-        
-        if item_type == 'sysmanual': return
-        
-        if item_type == 'category':
-            cat_idx = int(values[1])
-            if cat_idx == 0: return
-            
-            categories = self.current_sysmanual['categories']
-            categories[cat_idx], categories[cat_idx - 1] = categories[cat_idx - 1], categories[cat_idx]
-            
-        elif item_type == 'entry':
-            cat_idx = int(values[1])
-            entry_idx = int(values[2])
-            if entry_idx == 0: return
-            
-            entries = self.current_sysmanual['categories'][cat_idx]['entries']
-            entries[entry_idx], entries[entry_idx - 1] = entries[entry_idx - 1], entries[entry_idx]
-        
-        self.populate_tree()
-        self.select_item_after_move(item_type, values, -1)
-    
-    def move_item_down(self):
-        selection = self.tree.selection()
-        if not selection: return
-        
-        values = self.tree.item(selection[0], 'values')
-        if not values: return
-        
-        item_type = values[0]
-        
-        if item_type == 'sysmanual': return
-        
-        if item_type == 'category':
-            cat_idx = int(values[1])
-            categories = self.current_sysmanual['categories']
-            if cat_idx >= len(categories) - 1: return
-            
-            categories[cat_idx], categories[cat_idx + 1] = categories[cat_idx + 1], categories[cat_idx]
-            
-        elif item_type == 'entry':
-            cat_idx = int(values[1])
-            entry_idx = int(values[2])
-            entries = self.current_sysmanual['categories'][cat_idx]['entries']
-            if entry_idx >= len(entries) - 1: return
-            
-            entries[entry_idx], entries[entry_idx + 1] = entries[entry_idx + 1], entries[entry_idx]
-        
-        self.populate_tree()
-        self.select_item_after_move(item_type, values, 1)
-    
-    def select_item_after_move(self, item_type, old_values, direction):
-        if item_type == 'category':
-            new_idx = int(old_values[1]) + direction
-            for item in self.tree.get_children(self.tree.get_children()[0]):
-                if self.tree.item(item, 'values') == ('category', new_idx):
-                    self.tree.selection_set(item)
-                    self.tree.see(item)
-                    break
-        elif item_type == 'entry':
-            cat_idx = int(old_values[1])
-            new_entry_idx = int(old_values[2]) + direction
-            root = self.tree.get_children()[0]
-            categories = self.tree.get_children(root)
-            if cat_idx < len(categories):
-                cat_item = categories[cat_idx]
-                for entry_item in self.tree.get_children(cat_item):
-                    if self.tree.item(entry_item, 'values') == ('entry', cat_idx, new_entry_idx):
-                        self.tree.selection_set(entry_item)
-                        self.tree.see(entry_item)
-                        break
-    
-    def save_sysmanual(self):
-        if not self.current_sysmanual: return
-        
-        if not self.framework.validate_sysmanual(self.current_sysmanual):
-            self.window.lift(); self.window.focus_force(); return
-        
-        editor_window = self.window
-        
-        filepath = filedialog.asksaveasfilename(
-            title="Save SysManual",
-            defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
-            initialdir=Path("sysmanuals") if Path("sysmanuals").exists() else Path.cwd(),
-            initialfile=f"{self.current_sysmanual['id']}_sysmanual.json",
-            parent=self.window
-        )
-        
-        editor_window.lift(); editor_window.focus_force()
-        
-        if filepath:
-            try:
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(self.current_sysmanual, f, indent=2)
-                
-                # Reload the saved file into the main framework
-                self.framework.load_sysmanual_file(filepath)
-                # Update the load combobox
-                self.load_combo['values'] = list(self.framework.sysmanuals.keys())
-                
-                editor_window.lift(); editor_window.focus_force()
-                messagebox.showinfo("Success", f"SysManual saved to {Path(filepath).name}")
-                
-            except Exception as e:
-                messagebox.showerror("Save Error", f"Failed to save:\n{str(e)}")
-                editor_window.lift(); editor_window.focus_force()
\ No newline at end of file
+# sysmanual_editor.py (Canvas/Frame layout fix applied previously)
+
+import tkinter as tk
+from tkinter import ttk, messagebox, scrolledtext, filedialog
+import os
+import threading
+from functools import partial
+from pathlib import Path
+from typing import List, Tuple
+
+# Import the core utilities
+from sysmanual_core import SysManualCore 
+
+class SysManualGUIEditor:
+    def __init__(self, parent, framework):
+        self.framework = framework
+        self.core = framework.core # Access the SysManualCore instance
+        self.window = tk.Toplevel(parent)
+        self.window.title("SysManual GUI Editor")
+        self.window.geometry("1400x900")
+        
+        self.current_sysmanual = None
+        self.editing_item = None
+
+        # Treeview bookkeeping: ('category', idx) / ('entry', cat_idx, entry_idx) -> iid
+        self._iid_by_key = {}
+        self._root_iid = None
+
+        # Dynamic example/detail rows of the entry currently shown in the
+        # edit panel
+        self._example_frames = []
+        self._detail_frames = []
+
+        # Parsed files keyed by (path, mtime_ns) so re-opening an untouched
+        # file skips the JSON parse
+        self._file_cache = {}
+
+        # Lazily-built ID indexes so uniqueness checks don't re-walk the
+        # whole sysmanual on every add/duplicate; None means "rebuild"
+        self._entry_id_index = None
+        self._cat_id_index = None
+
+        # Reusable edit-panel widgets keyed by field label, so switching
+        # tree items reconfigures existing Entry/Text widgets instead of
+        # destroying and recreating them
+        self._field_pool = {}
+        self._text_pool = {}
+
+        # Pooled panel chrome: header labels and section frames with their
+        # add buttons, keyed by caption
+        self._header_pool = {}
+        self._section_pool = {}
+
+        # Tree right-click menu, created once and repopulated per post
+        self._tree_menu = None
+
+        # Save-dialog start directory, stat'ed once per editor window
+        self._save_initialdir = None
+
+        # True when the document may have changed since it last passed
+        # validation; lets Save skip the schema check for a no-op re-save
+        self._dirty = True
+
+        # Last iid the edit panel was built for; <<TreeviewSelect>> re-fires
+        # for the same row on focus changes and programmatic selection
+        self._last_selected_iid = None
+        
+        main_container = ttk.Frame(self.window)
+        main_container.pack(fill=tk.BOTH, expand=True)
+        
+        self.setup_toolbar()
+        
+        paned = ttk.PanedWindow(main_container, orient=tk.HORIZONTAL)
+        paned.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        left_frame = ttk.Frame(paned)
+        paned.add(left_frame, weight=1)
+        self.setup_tree(left_frame)
+        
+        right_frame = ttk.Frame(paned)
+        paned.add(right_frame, weight=2)
+        self.setup_edit_panel(right_frame)
+        
+        if framework.current_sysmanual:
+            self.load_sysmanual(framework.current_sysmanual)
+            
+    def _create_context_menu(self, widget, content_to_copy):
+        """Binds the shared right-click copy menu to a field widget."""
+        # One tk.Menu per editor window, shared by every field
+        return self.core.attach_shared_context_menu(self.window, widget, content_to_copy)
+
+    def setup_toolbar(self):
+        toolbar = ttk.Frame(self.window)
+        toolbar.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Button(toolbar, text="New SysManual", command=self.new_sysmanual).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="Open File", command=self.open_file).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="Save", command=self.save_sysmanual).pack(side=tk.LEFT, padx=2)
+        
+        ttk.Separator(toolbar, orient=tk.VERTICAL).pack(side=tk.LEFT, padx=10, fill=tk.Y)
+        
+        ttk.Label(toolbar, text="Load:").pack(side=tk.LEFT, padx=(5, 2))
+        self.load_combo = ttk.Combobox(toolbar, values=list(self.framework.sysmanuals.keys()), 
+                                       state="readonly", width=20)
+        self.load_combo.pack(side=tk.LEFT, padx=2)
+        self.load_combo.bind("<<ComboboxSelected>>", lambda e: self.load_sysmanual(self.load_combo.get()))
+    
+    def setup_tree(self, parent):
+        tree_frame = ttk.Frame(parent)
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Label(tree_frame, text="Structure", font=('Arial', 11, 'bold')).pack(anchor=tk.W, pady=5)
+        
+        tree_scroll = ttk.Scrollbar(tree_frame)
+        tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.tree = ttk.Treeview(tree_frame, yscrollcommand=tree_scroll.set)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        tree_scroll.config(command=self.tree.yview)
+        
+        self.tree.bind('<<TreeviewSelect>>', self.on_tree_select)
+        self.tree.bind('<<TreeviewOpen>>', self.on_tree_open)
+        self.tree.bind('<<TreeviewClose>>', self.on_tree_close)
+        self.tree.bind('<Button-3>', self.show_context_menu)
+    
+    def setup_edit_panel(self, parent):
+        # 1. Create Canvas and Scrollbar
+        canvas = tk.Canvas(parent)
+        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=canvas.yview)
+        
+        # 2. Create the inner frame that will hold the widgets
+        self.edit_frame = ttk.Frame(canvas)
+        
+        # 3. Define the configuration function for the inner frame.
+        # <Configure> fires once per packed child while the panel is being
+        # built, and canvas.bbox("all") walks every item — coalesce the
+        # recomputes into a single idle callback.
+        self._scroll_update_pending = False
+
+        def update_scrollregion():
+            self._scroll_update_pending = False
+            canvas.configure(scrollregion=canvas.bbox("all"))
+
+        def on_edit_frame_configure(event):
+            if self._scroll_update_pending:
+                return
+            self._scroll_update_pending = True
+            canvas.after_idle(update_scrollregion)
+
+        # 4. Define the configuration function for the canvas itself
+        def on_canvas_configure(event):
+            # CRITICAL FIX (PREVIOUSLY APPLIED): Ensure the inner frame (the window) always matches the canvas's width
+            # This prevents widgets from packing off-screen horizontally
+            canvas.itemconfig(self.canvas_window, width=event.width)
+        
+        # 5. Bind the inner frame and the canvas
+        self.edit_frame.bind("<Configure>", on_edit_frame_configure)
+        canvas.bind('<Configure>', on_canvas_configure) # New binding for width control
+
+        # 6. Place the inner frame inside the canvas, saving the window ID
+        self.canvas_window = canvas.create_window((0, 0), window=self.edit_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+        
+        # 7. Pack everything
+        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Bind mousewheel scrolling: one bind_all scoped by pointer
+        # enter/leave covers every child widget, instead of per-widget
+        # bindings that new rows would never inherit
+        def on_mousewheel(e):
+            canvas.yview_scroll(int(-1*(e.delta/120)), "units")
+
+        canvas.bind("<Enter>", lambda e: canvas.bind_all("<MouseWheel>", on_mousewheel))
+        canvas.bind("<Leave>", lambda e: canvas.unbind_all("<MouseWheel>"))
+        
+        ttk.Label(self.edit_frame, text="Select an item to edit", 
+                 font=('Arial', 12)).pack(pady=20)
+    
+    def new_sysmanual(self):
+        if self.current_sysmanual and messagebox.askyesno("New SysManual", 
+            "Create new sysmanual? Unsaved changes will be lost."):
+            self.current_sysmanual = None
+            self.tree.delete(*self.tree.get_children())
+            self.clear_edit_panel()
+        
+        template = {
+            "id": "new-sysmanual",
+            "name": "New SysManual",
+            "description": "Description",
+            "theme": {"primary": "#4CAF50", "accent": "#2196F3"},
+            "categories": []
+        }
+        self.current_sysmanual = template
+        self._dirty = True
+        self.populate_tree()
+        
+        # populate_tree tracks the root row, so there's no need to build
+        # the whole top-level sibling tuple just to grab index 0
+        if self._root_iid is not None:
+            self.tree.selection_set(self._root_iid)
+            self.on_tree_select(None)
+    
+    def open_file(self):
+        filepath = filedialog.askopenfilename(
+            title="Open SysManual JSON",
+            filetypes=[("JSON files", "*.json"), ("Gzipped JSON", "*.json.gz"),
+                       ("All files", "*.*")],
+            initialdir=Path("sysmanuals") if Path("sysmanuals").exists() else Path.cwd()
+        )
+        
+        if not filepath:
+            return
+
+        try:
+            cache_key = (filepath, os.stat(filepath).st_mtime_ns)
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to open:\n{str(e)}")
+            return
+
+        data = self._file_cache.get(cache_key)
+        if data is not None:
+            self._finish_open_file(data)
+            return
+
+        # Parse off the main thread so a multi-MB manual doesn't freeze
+        # the mainloop; the result is marshalled back via window.after
+        def worker():
+            try:
+                parsed = self.core.load_json_file(filepath)
+            except Exception as e:
+                self.window.after(0, messagebox.showerror, "Error", f"Failed to open:\n{str(e)}")
+                return
+
+            def apply():
+                self._file_cache[cache_key] = parsed
+                self._finish_open_file(parsed)
+
+            self.window.after(0, apply)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _finish_open_file(self, data):
+        """Validate parsed data and load it into the editor (main thread only)."""
+        if not self.framework.validate_sysmanual(data):
+            return
+        # Clone so editing never mutates the cached parse
+        self.current_sysmanual = self.core.fast_clone(data)
+        self._dirty = True
+        self.populate_tree()
+        messagebox.showinfo("Success", "Loaded successfully!")
+        # Bring the editor back above the main window; this used
+        # to happen (redundantly) on every populate_tree call
+        self.window.lift()
+        self.window.focus_force()
+
+
+    def load_sysmanual(self, sysmanual_id):
+        if sysmanual_id in self.framework.sysmanuals:
+            # Clone to prevent editing the framework's live data
+            self.current_sysmanual = self.core.fast_clone(self.framework.sysmanuals[sysmanual_id])
+            self._dirty = True
+            self.populate_tree()
+    
+    def populate_tree(self):
+        self.tree.delete(*self.tree.get_children())
+        self._iid_by_key = {}
+        self._root_iid = None
+        self._last_selected_iid = None
+        self._invalidate_id_indexes()
+
+        if not self.current_sysmanual:
+            return
+
+        root = self.tree.insert('', 'end', text=f"📘 {self.current_sysmanual['name']}",
+                               values=('sysmanual',), open=True)
+        self._root_iid = root
+
+        # Pre-build display strings so the insert loop only issues Tcl calls
+        categories = self.current_sysmanual.get('categories') or ()
+        cat_labels = [f"📁 {c['name']}" for c in categories]
+
+        for cat_idx, (category, label) in enumerate(zip(categories, cat_labels)):
+            cat_node = self.tree.insert(root, 'end', text=label,
+                                       values=('category', cat_idx))
+            self._iid_by_key[('category', cat_idx)] = cat_node
+
+            if category.get('entries'):
+                # Placeholder child so the expand arrow shows; the real
+                # entry rows are inserted lazily on <<TreeviewOpen>>
+                self.tree.insert(cat_node, 'end', text='', values=('lazy', cat_idx))
+
+    def on_tree_open(self, event):
+        """Materialize a category's entry rows when it is first expanded."""
+        iid = self.tree.focus()
+        if not iid:
+            return
+        values = self.tree.item(iid, 'values')
+        if values and values[0] == 'category':
+            self._load_category_entries(int(values[1]))
+
+    def on_tree_close(self, event):
+        """Collapse a category back to its placeholder, freeing its rows."""
+        iid = self.tree.focus()
+        if not iid:
+            return
+        values = self.tree.item(iid, 'values')
+        if values and values[0] == 'category':
+            self._unload_category_entries(int(values[1]))
+
+    def _unload_category_entries(self, cat_idx):
+        """Re-lazy a collapsed category so the tree holds only visible rows."""
+        cat_iid = self._iid_by_key.get(('category', cat_idx))
+        if cat_iid is None or self._tv_category_is_lazy(cat_iid):
+            return
+        children = self.tree.get_children(cat_iid)
+        if not children:
+            return
+        # Deleting a selected row would bounce the selection (and the edit
+        # panel); keep the rows if the user is working inside this category
+        if set(self.tree.selection()).intersection(children):
+            return
+        self.tree.delete(*children)
+        self._iid_by_key = {k: v for k, v in self._iid_by_key.items()
+                            if not (k[0] == 'entry' and k[1] == cat_idx)}
+        self.tree.insert(cat_iid, 'end', text='', values=('lazy', cat_idx))
+
+    def _load_category_entries(self, cat_idx):
+        """Replace a category's lazy placeholder with its real entry rows."""
+        cat_iid = self._iid_by_key.get(('category', cat_idx))
+        if cat_iid is None:
+            return
+
+        children = self.tree.get_children(cat_iid)
+        if children:
+            first_values = self.tree.item(children[0], 'values')
+            if not first_values or first_values[0] != 'lazy':
+                return  # Already materialized
+            self.tree.delete(children[0])
+
+        category = self.current_sysmanual['categories'][cat_idx]
+        # Pre-build display strings so the insert loop only issues Tcl calls
+        entries = category.get('entries') or ()
+        labels = [f"📄 {e['name']}" for e in entries]
+        for entry_idx, label in enumerate(labels):
+            iid = self.tree.insert(cat_iid, 'end', text=label,
+                                 values=('entry', cat_idx, entry_idx))
+            self._iid_by_key[('entry', cat_idx, entry_idx)] = iid
+
+    # --- ID index helpers ---
+
+    def _all_entry_ids(self):
+        """Set of every entry ID in the current sysmanual, built on demand."""
+        if self._entry_id_index is None:
+            self._entry_id_index = {
+                e['id']
+                for c in self.current_sysmanual.get('categories', [])
+                for e in c.get('entries', [])
+            }
+        return self._entry_id_index
+
+    def _all_category_ids(self):
+        """Set of every category ID in the current sysmanual, built on demand."""
+        if self._cat_id_index is None:
+            self._cat_id_index = {c['id'] for c in self.current_sysmanual.get('categories', [])}
+        return self._cat_id_index
+
+    def _invalidate_id_indexes(self):
+        self._entry_id_index = None
+        self._cat_id_index = None
+
+    def _on_id_edit(self, value):
+        """Commit hook for the ID fields: an edited ID makes the cached
+        uniqueness sets stale, so force a rebuild on next use."""
+        self._invalidate_id_indexes()
+
+    # --- Incremental Treeview helpers ---
+
+    def _tv_set_text(self, iid, icon, value):
+        """Refresh one tree row's label after its name field is edited."""
+        if iid is not None and self.tree.exists(iid):
+            self.tree.item(iid, text=f"{icon} {value}")
+
+    def _tv_category_is_lazy(self, cat_iid) -> bool:
+        """True if the category row still holds its unexpanded placeholder."""
+        children = self.tree.get_children(cat_iid)
+        if not children:
+            return False
+        first_values = self.tree.item(children[0], 'values')
+        return bool(first_values) and first_values[0] == 'lazy'
+
+    def _tv_set_category_index(self, cat_iid, cat_idx):
+        """Rewrite a category row's index and those of its materialized entries."""
+        self.tree.item(cat_iid, values=('category', cat_idx))
+        self._iid_by_key[('category', cat_idx)] = cat_iid
+        for j, child in enumerate(self.tree.get_children(cat_iid)):
+            child_values = self.tree.item(child, 'values')
+            if child_values and child_values[0] == 'lazy':
+                self.tree.item(child, values=('lazy', cat_idx))
+            else:
+                self.tree.item(child, values=('entry', cat_idx, j))
+                self._iid_by_key[('entry', cat_idx, j)] = child
+
+    def _tv_sync_categories(self, start=0):
+        """Renumber category rows from `start` on after an insert/delete."""
+        categories = self.tree.get_children(self._root_iid)
+        self._iid_by_key = {k: v for k, v in self._iid_by_key.items() if k[1] < start}
+        for i in range(start, len(categories)):
+            self._tv_set_category_index(categories[i], i)
+
+    def _tv_sync_entries(self, cat_idx, start=0):
+        """Renumber a category's materialized entry rows from `start` on."""
+        cat_iid = self._iid_by_key.get(('category', cat_idx))
+        if cat_iid is None or self._tv_category_is_lazy(cat_iid):
+            return
+        children = self.tree.get_children(cat_iid)
+        self._iid_by_key = {k: v for k, v in self._iid_by_key.items()
+                            if not (k[0] == 'entry' and k[1] == cat_idx and k[2] >= start)}
+        for j in range(start, len(children)):
+            self.tree.item(children[j], values=('entry', cat_idx, j))
+            self._iid_by_key[('entry', cat_idx, j)] = children[j]
+
+    def _tv_select(self, iid):
+        self.tree.selection_set(iid)
+        self.tree.see(iid)
+    
+    def on_tree_select(self, event):
+        selection = self.tree.selection()
+        if not selection:
+            return
+        
+        item = selection[0]
+        if item == self._last_selected_iid:
+            return  # Same row — the panel is already showing it
+
+        values = self.tree.item(item, 'values')
+
+        if not values:
+            return
+
+        self._last_selected_iid = item
+        item_type = values[0]
+        
+        if item_type == 'sysmanual':
+            self.show_sysmanual_editor()
+        elif item_type == 'category':
+            cat_idx = int(values[1])
+            self.show_category_editor(cat_idx)
+        elif item_type == 'entry':
+            cat_idx = int(values[1])
+            entry_idx = int(values[2])
+            self.show_entry_editor(cat_idx, entry_idx)
+    
+    def clear_edit_panel(self):
+        for widget in self.edit_frame.winfo_children():
+            if getattr(widget, '_pooled', False):
+                widget.pack_forget()
+            else:
+                widget.destroy()
+    
+    # --- Edit Panel Creators ---
+
+    def _debounce_write(self, var, target, ms=150):
+        """Commit var -> target['data'][target['key']] once typing pauses.
+
+        `target` is mutable so pooled widgets can be re-pointed at a
+        different dict/key without rebinding the trace. Callers that
+        re-point must use target['flush'] first (and target['cancel']
+        after the programmatic var.set) so the last <=150 ms of typing
+        lands in the old dict instead of being dropped or misdirected.
+        """
+        state = {'job': None}
+
+        def commit():
+            state['job'] = None
+            value = var.get()
+            target['data'][target['key']] = value
+            self._dirty = True
+            on_commit = target.get('on_commit')
+            if on_commit is not None:
+                on_commit(value)
+
+        def flush():
+            if state['job'] is not None:
+                self.window.after_cancel(state['job'])
+                commit()
+
+        def cancel():
+            if state['job'] is not None:
+                self.window.after_cancel(state['job'])
+                state['job'] = None
+
+        def on_change(*args):
+            if state['job'] is not None:
+                self.window.after_cancel(state['job'])
+            state['job'] = self.window.after(ms, commit)
+
+        target['flush'] = flush
+        target['cancel'] = cancel
+        var.trace('w', on_change)
+
+    def _debounce_text_write(self, text, target, ms=150):
+        """Debounced commit of a Text widget's content to its target dict/key.
+
+        As with _debounce_write, re-pointing callers run target['flush']
+        first — a pending job would otherwise fire after the widget has
+        been refilled and write the new item's text into the old dict.
+        """
+        state = {'job': None}
+
+        def commit():
+            state['job'] = None
+            target['data'][target['key']] = text.get('1.0', 'end-1c')
+            self._dirty = True
+
+        def flush():
+            if state['job'] is not None:
+                self.window.after_cancel(state['job'])
+                commit()
+
+        def on_key(event):
+            if state['job'] is not None:
+                self.window.after_cancel(state['job'])
+            state['job'] = self.window.after(ms, commit)
+
+        target['flush'] = flush
+        text.bind('<KeyRelease>', on_key)
+
+    def _get_header(self, text):
+        """Pack (and lazily create) the pooled panel header with `text`."""
+        header = self._header_pool.get(text)
+        if header is None:
+            header = ttk.Label(self.edit_frame, text=text, font=('Arial', 14, 'bold'))
+            header._pooled = True
+            self._header_pool[text] = header
+        header.pack(anchor=tk.W, pady=(10, 20), padx=10)
+        return header
+
+    def _get_section(self, title, add_label):
+        """Return (frame, add_button) for a pooled section LabelFrame.
+
+        Rows from the previously shown entry are destroyed; the caller
+        re-creates its rows, reconfigures the button's command, and packs
+        the button after them.
+        """
+        section = self._section_pool.get(title)
+        if section is None:
+            frame = ttk.LabelFrame(self.edit_frame, text=title, padding=10)
+            frame._pooled = True
+            button = ttk.Button(frame, text=add_label)
+            section = (frame, button)
+            self._section_pool[title] = section
+        frame, button = section
+        button.pack_forget()
+        for child in frame.winfo_children():
+            if child is not button:
+                flush = getattr(child, '_flush_pending', None)
+                if flush is not None:
+                    flush()
+                child.destroy()
+        frame.pack(fill=tk.BOTH, padx=10, pady=10)
+        return frame, button
+
+    def create_field(self, label, data_dict, key, parent=None, on_commit=None):
+        if parent is None:
+            parent = self.edit_frame
+            pooled = self._field_pool.get(label)
+            if pooled is not None:
+                frame, var, entry, target = pooled
+                # Land any in-flight debounced edit in the old dict first
+                target['flush']()
+                target['data'], target['key'] = data_dict, key
+                target['on_commit'] = on_commit
+                var.set(data_dict.get(key, ''))
+                # The set above fired the trace; showing an item isn't an
+                # edit, so drop the commit it scheduled
+                target['cancel']()
+                frame.pack(fill=tk.X, padx=10, pady=5)
+                return entry
+
+        frame = ttk.Frame(parent)
+        frame.pack(fill=tk.X, padx=10, pady=5)
+
+        ttk.Label(frame, text=label, width=15).pack(side=tk.LEFT)
+
+        target = {'data': data_dict, 'key': key, 'on_commit': on_commit}
+        var = tk.StringVar(value=data_dict.get(key, ''))
+        entry = ttk.Entry(frame, textvariable=var)
+        entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+
+        self._debounce_write(var, target)
+
+        # Add right-click copy (This calls the fixed core method)
+        self._create_context_menu(entry, var.get())
+
+        if parent is self.edit_frame:
+            frame._pooled = True
+            self._field_pool[label] = (frame, var, entry, target)
+
+        return entry
+
+    def create_text_field(self, label, data_dict, key, height=5, parent=None):
+        if parent is None:
+            parent = self.edit_frame
+            pooled = self._text_pool.get(label)
+            if pooled is not None:
+                frame, text, target = pooled
+                # Land any in-flight debounced edit in the old dict first
+                target['flush']()
+                target['data'], target['key'] = data_dict, key
+                text.delete('1.0', tk.END)
+                text.insert('1.0', data_dict.get(key, ''))
+                frame.pack(fill=tk.X, padx=10, pady=5)
+                return text
+
+        frame = ttk.LabelFrame(parent, text=label, padding=5)
+        frame.pack(fill=tk.X, padx=10, pady=5)
+
+        target = {'data': data_dict, 'key': key}
+        text = tk.Text(frame, height=height, wrap=tk.WORD)
+        text.pack(fill=tk.BOTH, expand=True)
+        text.insert('1.0', data_dict.get(key, ''))
+
+        self._debounce_text_write(text, target)
+
+        # Add right-click copy
+        self._create_context_menu(text, data_dict.get(key, ''))
+
+        if parent is self.edit_frame:
+            frame._pooled = True
+            self._text_pool[label] = (frame, text, target)
+
+        return text
+
+    def create_content_row(self, parent, entry, key):
+        frame = ttk.Frame(parent)
+        frame.pack(fill=tk.X, pady=2)
+
+        # Live key for this row — kept in sync when the user renames the
+        # field, so updates and deletion always target the right dict slot
+        row_state = {'key': key}
+
+        # grid the row in one pass — each pack() call would trigger its own
+        # geometry recomputation, which adds up when building many rows
+        ttk.Label(frame, text="Key:").grid(row=0, column=0)
+        key_entry = ttk.Entry(frame, width=15)
+        key_entry.insert(0, key)
+        key_entry.grid(row=0, column=1, padx=5)
+
+        ttk.Label(frame, text="Value:").grid(row=0, column=2)
+        value_entry = ttk.Entry(frame)
+        value_entry.insert(0, entry['content'][key])
+        value_entry.grid(row=0, column=3, sticky=tk.EW, padx=5)
+
+        # No StringVars: the widgets are read directly inside one debounced
+        # commit, so keystrokes skip the Tcl variable + trace chain and no
+        # per-row variables pile up in the interpreter
+        state = {'job': None}
+
+        def commit_content():
+            state['job'] = None
+            current_key = row_state['key']
+            new_key = key_entry.get()
+            if new_key != current_key:
+                # Rename: move the value to the new key and track it
+                entry['content'].pop(current_key, None)
+                row_state['key'] = new_key
+            entry['content'][new_key] = value_entry.get()
+            self._dirty = True
+
+        def update_content(event=None):
+            if state['job'] is not None:
+                self.window.after_cancel(state['job'])
+            state['job'] = self.window.after(150, commit_content)
+
+        def flush():
+            # Same contract as the pooled fields' target['flush']: land a
+            # pending edit while the widgets are still alive
+            if state['job'] is not None:
+                self.window.after_cancel(state['job'])
+                commit_content()
+
+        def cancel(event=None):
+            if state['job'] is not None:
+                self.window.after_cancel(state['job'])
+                state['job'] = None
+
+        frame._flush_pending = flush
+        # Safety net: a destroyed row must never leave a job firing
+        # against dead widgets (<Destroy> on a widget fires for itself
+        # only, not for siblings or children)
+        frame.bind('<Destroy>', cancel)
+
+        key_entry.bind('<KeyRelease>', update_content)
+        value_entry.bind('<KeyRelease>', update_content)
+
+        # Add right-click copy for the Content fields
+        self._create_context_menu(key_entry, key)
+        self._create_context_menu(value_entry, entry['content'][key])
+
+        ttk.Button(frame, text="×", width=3,
+                  command=partial(self.remove_content, entry, row_state, frame)).grid(row=0, column=4)
+        frame.columnconfigure(3, weight=1)
+
+    # --- Editor Displays ---
+
+    def show_sysmanual_editor(self):
+        self.clear_edit_panel()
+        
+        self._get_header("SysManual Settings")
+
+
+        self.create_field("ID:", self.current_sysmanual, 'id')
+        self.create_field("Name:", self.current_sysmanual, 'name',
+                          on_commit=partial(self._tv_set_text, self._root_iid, "📘"))
+        self.create_text_field("Description:", self.current_sysmanual, 'description', height=3)
+    
+    def show_category_editor(self, cat_idx):
+        self.clear_edit_panel()
+        
+        category = self.current_sysmanual['categories'][cat_idx]
+        
+        self._get_header("Category Settings")
+
+
+        self.create_field("ID:", category, 'id', on_commit=self._on_id_edit)
+        self.create_field("Name:", category, 'name',
+                          on_commit=partial(self._tv_set_text,
+                                            self._iid_by_key.get(('category', cat_idx)), "📁"))
+        
+        ttk.Button(self.edit_frame, text="+ Add Entry", 
+                  command=partial(self.add_entry, cat_idx)).pack(anchor=tk.W, padx=10, pady=10)
+    
+    def show_entry_editor(self, cat_idx, entry_idx):
+        self.clear_edit_panel()
+        
+        category = self.current_sysmanual['categories'][cat_idx]
+        entry = category['entries'][entry_idx]
+        
+        self._get_header("Entry Editor")
+
+
+        self.create_field("ID:", entry, 'id', on_commit=self._on_id_edit)
+        self.create_field("Name:", entry, 'name',
+                          on_commit=partial(self._tv_set_text,
+                                            self._iid_by_key.get(('entry', cat_idx, entry_idx)), "📄"))
+        self.create_text_field("Description:", entry, 'description', height=3)
+        
+        # Content
+        content_frame, add_content_btn = self._get_section("Content", "+ Add Content Field")
+        if 'content' not in entry: entry['content'] = {}
+        # Row creation doesn't mutate the dict, so iterate it directly
+        # rather than snapshotting the keys into a throwaway list
+        for key in entry['content']:
+            self.create_content_row(content_frame, entry, key)
+        add_content_btn.configure(command=partial(self.add_content_field, content_frame, entry))
+        add_content_btn.pack(anchor=tk.W, pady=5)
+
+        # Examples
+        examples_frame, add_example_btn = self._get_section("Examples", "+ Add Example")
+        if 'examples' not in entry: entry['examples'] = []
+        self._example_frames = []
+        for idx, example in enumerate(entry['examples']):
+            self.create_example_row(examples_frame, entry, idx)
+        add_example_btn.configure(command=partial(self.add_example, examples_frame, entry))
+        add_example_btn.pack(anchor=tk.W, pady=5)
+
+        # Details
+        details_frame, add_detail_btn = self._get_section("Details", "+ Add Detail")
+        if 'details' not in entry: entry['details'] = []
+        self._detail_frames = []
+        for idx, detail in enumerate(entry['details']):
+            self.create_detail_row(details_frame, entry, idx)
+        add_detail_btn.configure(command=partial(self.add_detail, details_frame, entry))
+        add_detail_btn.pack(anchor=tk.W, pady=5)
+        
+        # Notes
+        self.create_text_field("Notes:", entry, 'notes', height=3)
+        
+    # --- Item Manipulators (Add/Remove) ---
+        
+    def add_content_field(self, parent, entry):
+        key = f"field_{len(entry['content']) + 1}"
+        entry['content'][key] = ""
+        self._dirty = True
+        self.create_content_row(parent, entry, key)
+    
+    def remove_content(self, entry, row_state, frame):
+        # Land any pending rename first so the pop below targets the key
+        # the row is actually holding
+        frame._flush_pending()
+        # The row tracks its own current key, so this is a direct delete —
+        # no value scan that could wipe unrelated fields sharing a value
+        entry['content'].pop(row_state['key'], None)
+        self._dirty = True
+        frame.destroy()
+
+    def create_example_row(self, parent, entry, idx):
+        frame = ttk.LabelFrame(parent, text=f"Example {idx + 1}", padding=5)
+        frame.pack(fill=tk.X, pady=5)
+        
+        example = entry['examples'][idx]
+        
+        if isinstance(example, str):
+            example = {"command": example, "description": ""}
+            entry['examples'][idx] = example
+        
+        cmd_frame = ttk.Frame(frame); cmd_frame.pack(fill=tk.X, pady=2)
+        ttk.Label(cmd_frame, text="Command:").grid(row=0, column=0)
+        cmd_var = tk.StringVar(value=example.get('command', ''))
+        cmd_entry = ttk.Entry(cmd_frame, textvariable=cmd_var)
+        cmd_entry.grid(row=0, column=1, sticky=tk.EW, padx=5)
+        cmd_frame.columnconfigure(1, weight=1)
+        def set_command(*args):
+            # Direct assignment; .update({...}) allocates a dict per keystroke
+            example['command'] = cmd_var.get()
+            self._dirty = True
+        cmd_var.trace('w', set_command)
+        self._create_context_menu(cmd_entry, cmd_var.get())
+        
+        desc_frame = ttk.Frame(frame); desc_frame.pack(fill=tk.X, pady=2)
+        ttk.Label(desc_frame, text="Description:").grid(row=0, column=0)
+        desc_var = tk.StringVar(value=example.get('description', ''))
+        desc_entry = ttk.Entry(desc_frame, textvariable=desc_var)
+        desc_entry.grid(row=0, column=1, sticky=tk.EW, padx=5)
+        desc_frame.columnconfigure(1, weight=1)
+        def set_description(*args):
+            example['description'] = desc_var.get()
+            self._dirty = True
+        desc_var.trace('w', set_description)
+        self._create_context_menu(desc_entry, desc_var.get())
+        
+        # The row's current index is resolved from the tracked frame list at
+        # removal time, so the button stays correct as siblings come and go
+        ttk.Button(frame, text="Remove Example",
+                  command=partial(self.remove_example, entry, frame)).pack(anchor=tk.E, pady=2)
+
+        self._example_frames.append(frame)
+        return frame
+
+    def add_example(self, parent, entry):
+        entry['examples'].append({"command": "", "description": ""})
+        self._dirty = True
+        # Append just the one new row; existing rows are untouched
+        self.create_example_row(parent, entry, len(entry['examples']) - 1)
+
+    def remove_example(self, entry, frame):
+        try:
+            idx = self._example_frames.index(frame)
+        except ValueError:
+            return
+        if idx < len(entry['examples']):
+            entry['examples'].pop(idx)
+            self._dirty = True
+        self._example_frames.pop(idx)
+        frame.destroy()
+        # Renumber the labels of the rows that shifted down
+        for i in range(idx, len(self._example_frames)):
+            self._example_frames[i].configure(text=f"Example {i + 1}")
+    
+    def create_detail_row(self, parent, entry, idx):
+        frame = ttk.Frame(parent)
+        frame.pack(fill=tk.X, pady=2)
+        self._detail_frames.append(frame)
+
+        detail = entry['details'][idx]
+        
+        ttk.Label(frame, text="Label:").grid(row=0, column=0)
+        label_var = tk.StringVar(value=detail.get('label', ''))
+        label_entry = ttk.Entry(frame, textvariable=label_var, width=20)
+        label_entry.grid(row=0, column=1, padx=5)
+        def set_label(*args):
+            detail['label'] = label_var.get()
+            self._dirty = True
+        label_var.trace('w', set_label)
+        self._create_context_menu(label_entry, label_var.get())
+
+
+        ttk.Label(frame, text="Value:").grid(row=0, column=2)
+        value_var = tk.StringVar(value=detail.get('value', ''))
+        value_entry = ttk.Entry(frame, textvariable=value_var)
+        value_entry.grid(row=0, column=3, sticky=tk.EW, padx=5)
+        def set_value(*args):
+            detail['value'] = value_var.get()
+            self._dirty = True
+        value_var.trace('w', set_value)
+        self._create_context_menu(value_entry, value_var.get())
+
+
+        ttk.Button(frame, text="×", width=3,
+                  command=partial(self.remove_detail, entry, frame)).grid(row=0, column=4)
+        frame.columnconfigure(3, weight=1)
+
+    def add_detail(self, parent, entry):
+        entry['details'].append({"label": "", "value": ""})
+        self._dirty = True
+        # Re-create the new row only
+        self.create_detail_row(parent, entry, len(entry['details']) - 1)
+
+    def remove_detail(self, entry, frame):
+        # The row's index comes from the tracked frame list, so no
+        # winfo_children scan or full re-draw is needed
+        try:
+            idx = self._detail_frames.index(frame)
+        except ValueError:
+            return
+        if idx < len(entry['details']):
+            entry['details'].pop(idx)
+            self._dirty = True
+        self._detail_frames.pop(idx)
+        frame.destroy()
+    
+    # --- Duplication Methods ---
+    
+    def duplicate_category(self, cat_idx: int):
+        if not self.current_sysmanual:
+            return
+
+        categories = self.current_sysmanual['categories']
+        original_category = categories[cat_idx]
+        
+        existing_cat_ids = self._all_category_ids()
+        all_entry_ids = self._all_entry_ids()
+
+        # Use the core utility for deep copy and ID/Name processing
+        new_category = self.core.process_duplicated_category(original_category, existing_cat_ids, all_entry_ids)
+        self._dirty = True
+        existing_cat_ids.add(new_category['id'])
+        all_entry_ids.update(e['id'] for e in new_category.get('entries', []))
+
+        # Insert the new category right after the original
+        categories.insert(cat_idx + 1, new_category)
+
+        new_iid = self.tree.insert(self._root_iid, cat_idx + 1,
+                                   text=f"📁 {new_category['name']}",
+                                   values=('category', cat_idx + 1))
+        if new_category.get('entries'):
+            self.tree.insert(new_iid, 'end', text='', values=('lazy', cat_idx + 1))
+        self._tv_sync_categories(cat_idx + 1)
+        self._tv_select(new_iid)
+
+    def duplicate_entry(self, cat_idx: int, entry_idx: int):
+        if not self.current_sysmanual:
+            return
+        
+        category = self.current_sysmanual['categories'][cat_idx]
+        entries = category['entries']
+        original_entry = entries[entry_idx]
+
+        all_entry_ids = self._all_entry_ids()
+
+        # Use the core utility for deep copy and ID/Name processing
+        new_entry = self.core.process_duplicated_entry(original_entry, all_entry_ids)
+        all_entry_ids.add(new_entry['id'])
+
+        # Materialize the tree rows before the data model changes, then
+        # insert the new entry right after the original
+        self._load_category_entries(cat_idx)
+        entries.insert(entry_idx + 1, new_entry)
+        self._dirty = True
+
+        cat_iid = self._iid_by_key[('category', cat_idx)]
+        new_iid = self.tree.insert(cat_iid, entry_idx + 1,
+                                   text=f"📄 {new_entry['name']}",
+                                   values=('entry', cat_idx, entry_idx + 1))
+        self._tv_sync_entries(cat_idx, entry_idx + 1)
+        self._tv_select(new_iid)
+
+    # --- Tree/Data Manipulators (Move/Delete/Context) ---
+
+    def show_context_menu(self, event):
+        item = self.tree.identify_row(event.y)
+        if not item:
+            return
+        
+        # Don't touch the selection: selecting here would rebuild the edit
+        # panel just to show a menu. Actions get the clicked iid directly.
+        values = self.tree.item(item, 'values')
+
+        # Reuse one menu; allocating a Tcl Menu per right-click adds up
+        context_menu = self._tree_menu
+        if context_menu is None:
+            context_menu = self._tree_menu = tk.Menu(self.tree, tearoff=0)
+        else:
+            context_menu.delete(0, 'end')
+
+
+        if not values or values[0] == 'sysmanual':
+            context_menu.add_command(label="Add Category", command=self.add_category)
+        elif values[0] == 'category':
+            cat_idx = int(values[1])
+            context_menu.add_command(label="Add Entry", command=partial(self.add_entry, cat_idx))
+            context_menu.add_command(label="Duplicate Category", command=partial(self.duplicate_category, cat_idx))
+            context_menu.add_separator()
+            context_menu.add_command(label="Move Up ↑", command=partial(self.move_item_up, item))
+            context_menu.add_command(label="Move Down ↓", command=partial(self.move_item_down, item))
+            context_menu.add_separator()
+            context_menu.add_command(label="Delete Category", command=partial(self.delete_item, item))
+        elif values[0] == 'entry':
+            cat_idx = int(values[1])
+            entry_idx = int(values[2])
+            context_menu.add_command(label="Duplicate Entry", command=partial(self.duplicate_entry, cat_idx, entry_idx))
+            context_menu.add_separator()
+            context_menu.add_command(label="Move Up ↑", command=partial(self.move_item_up, item))
+            context_menu.add_command(label="Move Down ↓", command=partial(self.move_item_down, item))
+            context_menu.add_separator()
+            context_menu.add_command(label="Delete Entry", command=partial(self.delete_item, item))
+        
+        context_menu.post(event.x_root, event.y_root)
+    
+    def add_category(self):
+        if not self.current_sysmanual:
+            return
+        
+        existing_cat_ids = self._all_category_ids()
+        base_id = "new-category"
+        base_name = "New Category"
+
+        new_name, new_id = self.core.get_unique_name_and_id(base_name, base_id, existing_cat_ids)
+        existing_cat_ids.add(new_id)
+        
+        category = {
+            "id": new_id,
+            "name": new_name,
+            "entries": []
+        }
+        self.current_sysmanual['categories'].append(category)
+        self._dirty = True
+
+        cat_idx = len(self.current_sysmanual['categories']) - 1
+        cat_iid = self.tree.insert(self._root_iid, 'end', text=f"📁 {new_name}",
+                                   values=('category', cat_idx))
+        self._iid_by_key[('category', cat_idx)] = cat_iid
+        self._tv_select(cat_iid)
+    
+    def add_entry(self, cat_idx=None):
+        if not self.current_sysmanual:
+            return
+        
+        if cat_idx is None:
+            selection = self.tree.selection()
+            if not selection:
+                return
+            
+            values = self.tree.item(selection[0], 'values')
+            if not values or values[0] not in ['category', 'entry']:
+                return
+            
+            cat_idx = int(values[1])
+        
+        category = self.current_sysmanual['categories'][cat_idx]
+        entries = category['entries']
+
+        # Existing entry IDs (across all categories) from the maintained index
+        all_entry_ids = self._all_entry_ids()
+
+        base_id = "new-entry"
+        base_name = "New Entry"
+
+        new_name, new_id = self.core.get_unique_name_and_id(base_name, base_id, all_entry_ids)
+        all_entry_ids.add(new_id)
+
+        entry = {
+            "id": new_id,
+            "name": new_name,
+            "description": "Description",
+            "content": {},
+            "examples": [],
+            "details": [],
+            "notes": ""
+        }
+        # Materialize existing rows first so the new one isn't inserted twice
+        self._load_category_entries(cat_idx)
+        entries.append(entry)
+        self._dirty = True
+
+        cat_iid = self._iid_by_key[('category', cat_idx)]
+        entry_idx = len(entries) - 1
+        entry_iid = self.tree.insert(cat_iid, 'end', text=f"📄 {new_name}",
+                                     values=('entry', cat_idx, entry_idx))
+        self._iid_by_key[('entry', cat_idx, entry_idx)] = entry_iid
+        self.tree.item(cat_iid, open=True)
+        self._tv_select(entry_iid)
+    
+    def delete_item(self, item=None):
+        if item is None:
+            selection = self.tree.selection()
+            if not selection: return
+            item = selection[0]
+
+        values = self.tree.item(item, 'values')
+        if not values: return
+        
+        item_type = values[0]
+        
+        if item_type == 'sysmanual': return
+        
+        if not messagebox.askyesno("Confirm Delete", f"Delete this {item_type}?"):
+            self.window.lift(); self.window.focus_force(); return
+        
+        if item_type == 'category':
+            cat_idx = int(values[1])
+            removed = self.current_sysmanual['categories'].pop(cat_idx)
+            if self._cat_id_index is not None:
+                self._cat_id_index.discard(removed['id'])
+            if self._entry_id_index is not None:
+                for e in removed.get('entries', []):
+                    self._entry_id_index.discard(e['id'])
+            self.tree.delete(self._iid_by_key.pop(('category', cat_idx)))
+            self._tv_sync_categories(cat_idx)
+        elif item_type == 'entry':
+            cat_idx = int(values[1])
+            entry_idx = int(values[2])
+            removed = self.current_sysmanual['categories'][cat_idx]['entries'].pop(entry_idx)
+            if self._entry_id_index is not None:
+                self._entry_id_index.discard(removed['id'])
+            self.tree.delete(self._iid_by_key.pop(('entry', cat_idx, entry_idx)))
+            self._tv_sync_entries(cat_idx, entry_idx)
+
+        self._dirty = True
+        self.clear_edit_panel()
+        self._last_selected_iid = None
+    
+    def move_item_up(self, item=None):
+        if item is None:
+            selection = self.tree.selection()
+            if not selection: return
+            item = selection[0]
+
+        values = self.tree.item(item, 'values')
+        if not values: return
+        
+        item_type = values[0]
+        
+        if item_type == 'sysmanual': return
+        
+        if item_type == 'category':
+            cat_idx = int(values[1])
+            if cat_idx == 0: return
+
+            categories = self.current_sysmanual['categories']
+            categories[cat_idx], categories[cat_idx - 1] = categories[cat_idx - 1], categories[cat_idx]
+            self._dirty = True
+            self._tv_move_category(cat_idx, cat_idx - 1)
+
+        elif item_type == 'entry':
+            cat_idx = int(values[1])
+            entry_idx = int(values[2])
+            if entry_idx == 0: return
+
+            entries = self.current_sysmanual['categories'][cat_idx]['entries']
+            entries[entry_idx], entries[entry_idx - 1] = entries[entry_idx - 1], entries[entry_idx]
+            self._dirty = True
+            self._tv_move_entry(cat_idx, entry_idx, entry_idx - 1)
+    
+    def move_item_down(self, item=None):
+        if item is None:
+            selection = self.tree.selection()
+            if not selection: return
+            item = selection[0]
+
+        values = self.tree.item(item, 'values')
+        if not values: return
+        
+        item_type = values[0]
+        
+        if item_type == 'sysmanual': return
+        
+        if item_type == 'category':
+            cat_idx = int(values[1])
+            categories = self.current_sysmanual['categories']
+            if cat_idx >= len(categories) - 1: return
+
+            categories[cat_idx], categories[cat_idx + 1] = categories[cat_idx + 1], categories[cat_idx]
+            self._dirty = True
+            self._tv_move_category(cat_idx, cat_idx + 1)
+
+        elif item_type == 'entry':
+            cat_idx = int(values[1])
+            entry_idx = int(values[2])
+            entries = self.current_sysmanual['categories'][cat_idx]['entries']
+            if entry_idx >= len(entries) - 1: return
+
+            entries[entry_idx], entries[entry_idx + 1] = entries[entry_idx + 1], entries[entry_idx]
+            self._dirty = True
+            self._tv_move_entry(cat_idx, entry_idx, entry_idx + 1)
+
+    def _tv_move_category(self, old_idx, new_idx):
+        """Move one category row in place and renumber the swapped pair."""
+        iid = self._iid_by_key[('category', old_idx)]
+        other = self._iid_by_key[('category', new_idx)]
+        self.tree.move(iid, self._root_iid, new_idx)
+        self._tv_set_category_index(iid, new_idx)
+        self._tv_set_category_index(other, old_idx)
+        # The moved row keeps its iid, so the same-iid guard in
+        # on_tree_select would skip the rebuild and leave panel buttons
+        # holding the pre-move index
+        self._last_selected_iid = None
+        self._tv_select(iid)
+
+    def _tv_move_entry(self, cat_idx, old_idx, new_idx):
+        """Move one entry row in place and renumber the swapped pair."""
+        iid = self._iid_by_key[('entry', cat_idx, old_idx)]
+        other = self._iid_by_key[('entry', cat_idx, new_idx)]
+        cat_iid = self._iid_by_key[('category', cat_idx)]
+        self.tree.move(iid, cat_iid, new_idx)
+        self.tree.item(iid, values=('entry', cat_idx, new_idx))
+        self.tree.item(other, values=('entry', cat_idx, old_idx))
+        self._iid_by_key[('entry', cat_idx, new_idx)] = iid
+        self._iid_by_key[('entry', cat_idx, old_idx)] = other
+        # See _tv_move_category: force the panel rebuild on re-select
+        self._last_selected_iid = None
+        self._tv_select(iid)
+    
+    def _refocus_window(self):
+        """Raise and refocus the editor once the pending Tk events settle."""
+        self.window.after_idle(lambda: (self.window.lift(), self.window.focus_force()))
+
+    def save_sysmanual(self):
+        if not self.current_sysmanual: return
+
+        try:
+            self._do_save_sysmanual()
+        finally:
+            # One deferred lift/focus per save; the dialogs and message
+            # boxes above each used to force their own window-manager
+            # round-trip
+            self._refocus_window()
+
+    def _do_save_sysmanual(self):
+        # Every mutation path sets _dirty; when it's clear, the document
+        # is byte-identical to one that already passed validation
+        if self._dirty:
+            if not self.framework.validate_sysmanual(self.current_sysmanual):
+                return
+            self._dirty = False
+
+        if self._save_initialdir is None:
+            # Checked once, not per dialog — exists() is a filesystem
+            # stat and a visible hiccup on network mounts
+            self._save_initialdir = Path("sysmanuals") if Path("sysmanuals").exists() else Path.cwd()
+
+        filepath = filedialog.asksaveasfilename(
+            title="Save SysManual",
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("Gzipped JSON", "*.json.gz"),
+                       ("All files", "*.*")],
+            initialdir=self._save_initialdir,
+            initialfile=f"{self.current_sysmanual['id']}_sysmanual.json",
+            parent=self.window
+        )
+
+        if filepath:
+            try:
+                self.core.save_sysmanual_file(self.current_sysmanual, filepath)
+                
+                # Register the in-memory manual directly — it was validated
+                # above, so re-reading and re-validating the file we just
+                # wrote is redundant
+                saved = self.core.fast_clone(self.current_sysmanual)
+                sysmanual_id = saved['id']
+                is_new = sysmanual_id not in self.framework.sysmanuals
+                self.framework.sysmanuals[sysmanual_id] = saved
+                self.framework.searcher.clear_cache()
+                self.framework.searcher.index_sysmanual(saved)
+                # Only round-trip the combo lists through Tk for a new ID
+                if is_new:
+                    combo_values = list(self.framework.sysmanuals.keys())
+                    self.load_combo['values'] = combo_values
+                    try:
+                        self.framework.sysmanual_combo['values'] = combo_values
+                    except Exception:
+                        pass
+                
+                messagebox.showinfo("Success", f"SysManual saved to {Path(filepath).name}")
+
+            except Exception as e:
+                messagebox.showerror("Save Error", f"Failed to save:\n{str(e)}")
\ No newline at end of file
@@ -1,70 +1,87 @@
-# sysmanual_schema.py
-
-SYS_MANUAL_SCHEMA = {
-    "$schema": "http://json-schema.org/draft-07/schema#",
-    "type": "object",
-    "required": ["id", "name", "description", "categories"],
-    "properties": {
-        "id": {"type": "string"},
-        "name": {"type": "string"},
-        "description": {"type": "string"},
-        "theme": {
-            "type": "object",
-            "properties": {
-                "primary": {"type": "string"},
-                "accent": {"type": "string"}
-            }
-        },
-        "categories": {
-            "type": "array",
-            "items": {
-                "type": "object",
-                "required": ["id", "name", "entries"],
-                "properties": {
-                    "id": {"type": "string"},
-                    "name": {"type": "string"},
-                    "entries": {
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "required": ["id", "name", "description"],
-                            "properties": {
-                                "id": {"type": "string"},
-                                "name": {"type": "string"},
-                                "description": {"type": "string"},
-                                "content": {"type": "object"},
-                                "examples": {
-                                    "type": "array",
-                                    "items": {
-                                        "oneOf": [
-                                            {"type": "string"},
-                                            {
-                                                "type": "object",
-                                                "required": ["command"],
-                                                "properties": {
-                                                    "command": {"type": "string"},
-                                                    "description": {"type": "string"}
-                                                }
-                                            }
-                                        ]
-                                    }
-                                },
-                                "details": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "object",
-                                        "properties": {
-                                            "label": {"type": "string"},
-                                            "value": {"type": "string"}
-                                        }
-                                    }
-                                },
-                                "notes": {"type": "string"}
-                            }
-                        }
-                    }
-                }
-            }
-        }
-    }
-}
\ No newline at end of file
+# sysmanual_schema.py
+
+from types import MappingProxyType
+
+# One shared leaf for every plain-string property instead of a dozen
+# identical single-key dicts
+_STR = {"type": "string"}
+
+_SYS_MANUAL_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "required": ["id", "name", "description", "categories"],
+    "properties": {
+        "id": _STR,
+        "name": _STR,
+        "description": _STR,
+        "theme": {
+            "type": "object",
+            "properties": {
+                "primary": _STR,
+                "accent": _STR
+            }
+        },
+        "categories": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["id", "name", "entries"],
+                "properties": {
+                    "id": _STR,
+                    "name": _STR,
+                    "entries": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "required": ["id", "name", "description"],
+                            "properties": {
+                                "id": _STR,
+                                "name": _STR,
+                                "description": _STR,
+                                "content": {"type": "object"},
+                                "examples": {
+                                    "type": "array",
+                                    "items": {
+                                        "oneOf": [
+                                            _STR,
+                                            {
+                                                "type": "object",
+                                                "required": ["command"],
+                                                "properties": {
+                                                    "command": _STR,
+                                                    "description": _STR
+                                                }
+                                            }
+                                        ]
+                                    }
+                                },
+                                "details": {
+                                    "type": "array",
+                                    "items": {
+                                        "type": "object",
+                                        "properties": {
+                                            "label": _STR,
+                                            "value": _STR
+                                        }
+                                    }
+                                },
+                                "notes": _STR
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+# Sub-schemas for validating just an edited category or entry without
+# re-checking the whole document
+CATEGORY_SCHEMA = _SYS_MANUAL_SCHEMA["properties"]["categories"]["items"]
+ENTRY_SCHEMA = CATEGORY_SCHEMA["properties"]["entries"]["items"]
+
+# Public read-only view: validators and digests are cached against this
+# object, so accidental top-level mutation would silently invalidate
+# them. (Only the top level is frozen; treat the nested dicts as
+# read-only too.)
+SYS_MANUAL_SCHEMA = MappingProxyType(_SYS_MANUAL_SCHEMA)